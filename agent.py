@@ -1,23 +1,58 @@
 from __future__ import annotations as _annotations
 
-import json
+import os
 import re
-from dataclasses import dataclass, field
+import signal
+import threading
+import time
+from dataclasses import dataclass, field, replace
+from functools import lru_cache
 from pathlib import Path
-from typing import List, Optional, Dict
+from typing import Any, Callable, FrozenSet, List, Optional, Dict, Tuple
+
+try:
+    import ahocorasick
+except ImportError:  # C extension unavailable, fall back to pure Python
+    ahocorasick = None
+    from flashtext import KeywordProcessor
+
+try:
+    from re import _parser as sre_parse  # Python 3.11+
+except ImportError:
+    import sre_parse
 
 from dotenv import load_dotenv
 from pydantic_ai import Agent, RunContext
 
+from helpers import json_io
 from models import Questionnaire, Response
 
 load_dotenv()
 
+RESPONSE_PATH = Path("data/response.ndjson")
+# Kept apart from data/response.json, which migrate_responses reads as legacy input
+EXPORT_PATH = Path("data/response_export.json")
+SUSPICIOUS_TERMS_PATH = Path("data/suspicious_keywords.json")
+
+
+@dataclass(frozen=True)
+class SuspiciousTerms:
+    """Suspicious keywords and patterns, precompiled for matching."""
+    keywords: List[str]
+    patterns: List[Dict]
+    single_keywords: FrozenSet[str]
+    keyword_automaton: Optional[Any]
+    literal_patterns: List[Tuple[str, str]]
+    prematched_patterns: List[Tuple[str, re.Pattern, str]]
+    regex_patterns: List[Tuple[re.Pattern, str]]
+    pattern_regex: Optional[re.Pattern]
+
 
 @dataclass
 class Deps:
-    questionnaire: Questionnaire
-    response_path: Path = Path("data/response.json")
+    # Only None on the template from make_shared_deps, never inside a run
+    questionnaire: Optional[Questionnaire] = None
+    response_path: Path = RESPONSE_PATH
     min_investment_amount: float = 0.0
     required_fields: List[str] = field(default_factory=lambda: [
         "investor_name",
@@ -27,18 +62,373 @@ class Deps:
         "signature_present",
         "tax_id_provided"
     ])
-    suspicious_keywords: List[str] = field(default_factory=list)
-    suspicious_patterns: List[Dict] = field(default_factory=list)
+    terms: SuspiciousTerms = field(default_factory=lambda: _TERMS)
+    # Derived from required_fields and min_investment_amount
+    validator: Callable[[Questionnaire], List[str]] = field(
+        init=False, repr=False
+    )
+
+    def __post_init__(self):
+        self.validator = build_validator(
+            tuple(self.required_fields), self.min_investment_amount
+        )
+
+
+def load_suspicious_terms(
+    path: Path = SUSPICIOUS_TERMS_PATH
+) -> tuple[List[str], List[Dict]]:
+    """Load suspicious keywords and patterns from JSON file.
+
+    Keywords and patterns are lowercased so they can be matched against
+    lowercased text without ``re.IGNORECASE``. Results are cached until the
+    file's modification time changes, so the returned lists are shared and
+    must not be mutated.
+    """
+    try:
+        mtime = os.path.getmtime(path)
+    except OSError:
+        return [], []
+    return _load_suspicious_terms(str(path), mtime)
 
 
-def load_suspicious_terms() -> tuple[List[str], List[Dict]]:
-    """Load suspicious keywords and patterns from JSON file."""
+@lru_cache(maxsize=8)
+def _load_suspicious_terms(
+    path: str, mtime: float
+) -> tuple[List[str], List[Dict]]:
     try:
-        with open("data/suspicious_keywords.json", "r") as f:
-            data = json.load(f)
-            return data["keywords"], data["patterns"]
-    except (FileNotFoundError, json.JSONDecodeError):
+        with open(path, "r", encoding="utf-8") as f:
+            data = json_io.load(f)
+    except (FileNotFoundError, json_io.JSONDecodeError):
         return [], []
+    keywords = [kw.lower() for kw in data["keywords"]]
+    patterns = []
+    for p in data["patterns"]:
+        p = {**p, "pattern": _lowercase_pattern(p["pattern"])}
+        if p.get("preMatch"):
+            p["preMatch"] = p["preMatch"].lower()
+        patterns.append(p)
+    return keywords, patterns
+
+
+# Regex syntax whose case is significant: escapes like \S and (?P groups
+_CASE_SENSITIVE_SYNTAX_RE = re.compile(r"(\\.|\(\?P)", re.DOTALL)
+
+
+def _lowercase_pattern(pattern: str) -> str:
+    """Lowercase a regex pattern, leaving case-sensitive syntax intact."""
+    parts = _CASE_SENSITIVE_SYNTAX_RE.split(pattern)
+    # split() with a capturing group puts the syntax tokens at odd indices
+    return "".join(
+        part if i % 2 else part.lower() for i, part in enumerate(parts)
+    )
+
+
+_TOKEN_RE = re.compile(r"\w+")
+
+
+def _is_single_token(keyword: str) -> bool:
+    return _TOKEN_RE.fullmatch(keyword) is not None
+
+
+def split_single_keywords(keywords: List[str]) -> FrozenSet[str]:
+    """Return the keywords that are a single word token.
+
+    These can be matched with a set intersection against the text's tokens.
+    """
+    return frozenset(kw for kw in keywords if _is_single_token(kw))
+
+
+def build_keyword_automaton(keywords: List[str]) -> Optional[Any]:
+    """Build a matcher for the multi-token keywords."""
+    keywords = [kw for kw in keywords if not _is_single_token(kw)]
+    if not keywords:
+        return None
+    if ahocorasick is None:
+        processor = KeywordProcessor(case_sensitive=True)
+        for kw in keywords:
+            processor.add_keyword(kw)
+        return processor
+    automaton = ahocorasick.Automaton()
+    for kw in keywords:
+        automaton.add_word(kw, (len(kw), kw))
+    automaton.make_automaton()
+    return automaton
+
+
+def _literal_parts(pattern: str) -> Tuple[bool, str]:
+    """Analyse a regex for literal text every match must contain.
+
+    Returns whether the whole pattern is a plain literal, and the longest
+    literal substring any match is guaranteed to contain ("" if none).
+    """
+    try:
+        parsed = sre_parse.parse(pattern)
+    except re.error:
+        return False, ""
+    is_literal = True
+    longest, run = "", ""
+    for op, av in parsed:
+        if op is sre_parse.LITERAL:
+            run += chr(av)
+            continue
+        is_literal = False
+        if op is sre_parse.AT:
+            # Anchors are zero-width, so the literal run continues
+            continue
+        if (op in (sre_parse.MAX_REPEAT, sre_parse.MIN_REPEAT)
+                and av[0] > 0 and len(av[2]) == 1
+                and av[2][0][0] is sre_parse.LITERAL):
+            # e.g. \.{3,} requires at least three consecutive dots
+            repeated = chr(av[2][0][1]) * av[0]
+            run += repeated
+            if av[1] == av[0]:
+                continue
+            longest = max(longest, run, key=len)
+            run = repeated
+            continue
+        longest = max(longest, run, key=len)
+        run = ""
+    longest = max(longest, run, key=len)
+    return is_literal, longest
+
+
+# Patterns slower than this on any probe string are rejected at load time
+_PATTERN_TIME_BUDGET = 0.05
+# Runs of a repeated character ending in one that breaks the run, so
+# patterns that only backtrack on a failing suffix are caught. Lengths grow
+# gradually first so exponential blowups trip the budget before they hang.
+_BACKTRACK_PROBES = [
+    char * n + "!"
+    for n in (*range(4, 36, 4), 1_000, 10_000)
+    for char in ("x", "a", " ", "1")
+]
+
+
+class _PatternTimeout(Exception):
+    pass
+
+
+def _raise_pattern_timeout(signum, frame):
+    raise _PatternTimeout
+
+
+def _search_is_too_slow(regex: re.Pattern, probe: str) -> bool:
+    """Check whether searching one probe exceeds the time budget.
+
+    Where SIGALRM is available (Unix, main thread) the search is interrupted
+    at the budget so a catastrophically backtracking pattern can't hang the
+    loader; elsewhere the search is only timed. Any timer the process had
+    running is restored afterwards.
+    """
+    use_alarm = (
+        hasattr(signal, "setitimer")
+        and threading.current_thread() is threading.main_thread()
+    )
+    if use_alarm:
+        previous = signal.signal(signal.SIGALRM, _raise_pattern_timeout)
+        old_delay, old_interval = signal.setitimer(
+            signal.ITIMER_REAL, _PATTERN_TIME_BUDGET
+        )
+    start = time.perf_counter()
+    try:
+        regex.search(probe)
+    except _PatternTimeout:
+        return True
+    finally:
+        elapsed = time.perf_counter() - start
+        if use_alarm:
+            signal.setitimer(signal.ITIMER_REAL, 0)
+            signal.signal(signal.SIGALRM, previous)
+            if old_delay:
+                signal.setitimer(
+                    signal.ITIMER_REAL,
+                    max(old_delay - elapsed, 1e-6),
+                    old_interval
+                )
+    return elapsed > _PATTERN_TIME_BUDGET
+
+
+def _is_too_slow(regex: re.Pattern) -> bool:
+    """Check whether a regex exceeds the time budget on any probe string."""
+    return any(
+        _search_is_too_slow(regex, probe) for probe in _BACKTRACK_PROBES
+    )
+
+
+def split_patterns(patterns: List[Dict]) -> Tuple[
+    List[Tuple[str, str]],
+    List[Tuple[str, re.Pattern, str]],
+    List[Tuple[re.Pattern, str]],
+    Optional[re.Pattern]
+]:
+    """Split suspicious patterns by how cheaply they can be matched.
+
+    Returns:
+        - (literal, description) for plain-text patterns, matched with ``in``
+        - (prematch, regex, description) for regexes containing a required
+          literal, taken from the entry's ``preMatch`` or extracted from the
+          pattern; the regex only runs if the literal is in the text
+        - (regex, description) for the remaining patterns, each compiled
+          on its own
+        - a single alternation of those remaining patterns, each wrapped in
+          a named group ``p<index>`` so a match can be mapped back to its
+          entry via ``match.lastgroup``; None if they can't be combined
+          (backreferences, global flags, clashing group names), in which
+          case the separately compiled regexes are used instead
+
+    Invalid patterns and patterns that take too long on a long probe string
+    (a sign of catastrophic backtracking) are skipped with a warning.
+    """
+    literal_patterns = []
+    prematched_patterns = []
+    regex_patterns = []
+    groups = []
+    for i, p in enumerate(patterns):
+        is_literal, prematch = _literal_parts(p["pattern"])
+        if is_literal:
+            literal_patterns.append((prematch, p["description"]))
+            continue
+        try:
+            regex = re.compile(p["pattern"])
+        except re.error as e:
+            print(f"Skipping invalid pattern {p['pattern']!r}: {e}")
+            continue
+        if _is_too_slow(regex):
+            print(f"Skipping slow pattern {p['pattern']!r}")
+            continue
+        if p.get("preMatch") or prematch:
+            prematched_patterns.append((
+                p.get("preMatch") or prematch, regex, p["description"]
+            ))
+        else:
+            regex_patterns.append((regex, p["description"]))
+            groups.append(f"(?P<p{i}>{p['pattern']})")
+    pattern_regex = None
+    if groups:
+        try:
+            pattern_regex = re.compile("|".join(groups))
+        except re.error as e:
+            print(f"Matching patterns separately, can't combine them: {e}")
+    return (
+        literal_patterns, prematched_patterns, regex_patterns, pattern_regex
+    )
+
+
+def _is_word_char(ch: str) -> bool:
+    return ch.isalnum() or ch == "_"
+
+
+def _find_flashtext_keyword(
+    processor: Any, text: str, lo: int, hi: int
+) -> Optional[str]:
+    """Find a whole-word keyword in text[lo:hi] with the flashtext fallback.
+
+    FlashText only treats ASCII letters, digits and _ as word characters and
+    reports non-overlapping longest matches, so every span is re-checked
+    against the full text. After a rejected span the overlapping matches it
+    may have hidden are searched for too.
+    """
+    while lo < hi:
+        for kw, start, end in processor.extract_keywords(
+            text[lo:hi], span_info=True
+        ):
+            start += lo
+            end += lo
+            # Emulate \b on both sides of the match
+            if start > 0 and _is_word_char(text[start - 1]):
+                break
+            if end < len(text) and _is_word_char(text[end]):
+                shorter = _find_flashtext_keyword(
+                    processor, text, start, end - 1
+                )
+                if shorter:
+                    return shorter
+                break
+            return kw
+        else:
+            return None
+        lo = start + 1
+    return None
+
+
+def find_keyword(automaton: Optional[Any], text: str) -> Optional[str]:
+    """Return the first keyword found in lowercased text as a whole word."""
+    if automaton is None:
+        return None
+    if ahocorasick is None:
+        return _find_flashtext_keyword(automaton, text, 0, len(text))
+    for end, (length, kw) in automaton.iter(text):
+        start = end - length + 1
+        # Emulate \b on both sides of the match
+        if start > 0 and _is_word_char(text[start - 1]):
+            continue
+        if end + 1 < len(text) and _is_word_char(text[end + 1]):
+            continue
+        return kw
+    return None
+
+
+def _precompile(keywords: List[str], patterns: List[Dict]) -> SuspiciousTerms:
+    (
+        literal_patterns, prematched_patterns, regex_patterns, pattern_regex
+    ) = split_patterns(patterns)
+    return SuspiciousTerms(
+        keywords=keywords,
+        patterns=patterns,
+        single_keywords=split_single_keywords(keywords),
+        keyword_automaton=build_keyword_automaton(keywords),
+        literal_patterns=literal_patterns,
+        prematched_patterns=prematched_patterns,
+        regex_patterns=regex_patterns,
+        pattern_regex=pattern_regex
+    )
+
+
+# Precompiled once at import so each questionnaire only pays for the scan
+_TERMS = _precompile(*load_suspicious_terms())
+
+
+def reload_suspicious_terms(path: Path = SUSPICIOUS_TERMS_PATH) -> None:
+    """Reload and precompile suspicious terms after the JSON file changes."""
+    global _TERMS
+    _load_suspicious_terms.cache_clear()
+    _TERMS = _precompile(*load_suspicious_terms(path))
+
+
+# Boolean fields that count as missing when False
+_FLAG_FIELDS = {"tax_id_provided", "signature_present"}
+
+
+@lru_cache(maxsize=8)
+def build_validator(
+    required_fields: Tuple[str, ...], min_investment_amount: float
+) -> Callable[[Questionnaire], List[str]]:
+    """Build a validator returning the missing required fields.
+
+    The checks are generated as one straight-line function, so each call
+    does no per-field dispatch.
+    """
+    lines = ["def validate(q):", "    missing = []"]
+    for field_name in required_fields:
+        if not field_name.isidentifier():
+            raise ValueError(f"Invalid required field name: {field_name!r}")
+        if field_name in _FLAG_FIELDS:
+            lines.append(f"    if not q.{field_name}:")
+        elif field_name == "investment_amount":
+            lines.append(f"    value = q.{field_name}")
+            lines.append("    if not value or value <= minimum:")
+        else:
+            lines.append(f"    value = q.{field_name}")
+            lines.append(
+                "    if value is None or "
+                "(isinstance(value, str) and not value.strip()):"
+            )
+        lines.append(f"        missing.append({field_name!r})")
+    lines.append("    return missing")
+
+    namespace = {"minimum": min_investment_amount}
+    exec("\n".join(lines), namespace)
+    return namespace["validate"]
 
 
 questionnaire_agent = Agent(
@@ -54,57 +444,85 @@ questionnaire_agent = Agent(
 )
 
 
-@questionnaire_agent.tool
-async def basic_review(ctx: RunContext[Deps]) -> List[str]:
-    """Check for required fields and perform basic validations."""
-    q = ctx.deps.questionnaire
-    missing_fields = []
+# Built once; only the questionnaire values are filled in per run
+PROMPT_TEMPLATE = (
+    "Review this investment questionnaire:\n"
+    "- Investor Name: {q.investor_name}\n"
+    "- Investment Amount: {q.investment_amount}\n"
+    "- Accreditation Status: {accreditation_status}\n"
+    "- Accreditation Details: {q.accreditation_details}\n"
+    "- Source of Funds: {q.source_of_funds_description}\n"
+    "- Tax ID Provided: {q.tax_id_provided}\n"
+    "- Signature Present: {q.signature_present}\n"
+    "\n"
+    "Use the tools to check for issues and make a decision "
+    "(Approve, Return or Escalate).\n"
+)
+
+
+def _basic_review_sync(deps: Deps) -> List[str]:
+    q = deps.questionnaire
     
     print("\nChecking required fields...")
     
-    for field_name in ctx.deps.required_fields:
-        value = getattr(q, field_name)
-        if field_name in ["tax_id_provided", "signature_present"]:
-            if not value:  # Check if boolean is False
-                missing_fields.append(field_name)
-                print(f"Missing {field_name}")
-        elif value is None or (isinstance(value, str) and not value.strip()):
-            missing_fields.append(field_name)
+    missing_fields = deps.validator(q)
+    for field_name in missing_fields:
+        if field_name == "investment_amount" and q.investment_amount is not None:
+            print(f"Invalid {field_name}: {q.investment_amount}")
+        else:
             print(f"Missing {field_name}")
-        elif field_name == "investment_amount" and (
-            not value or value <= ctx.deps.min_investment_amount
-        ):
-            missing_fields.append(field_name)
-            print(f"Invalid {field_name}: {value}")
     
     print(f"Found {len(missing_fields)} missing fields")
     
     return missing_fields
 
 
-@questionnaire_agent.tool
-async def ambiguity_checker(ctx: RunContext[Deps]) -> Optional[str]:
-    """Analyze text fields for ambiguity and concerning terms."""
-    q = ctx.deps.questionnaire
+def _ambiguity_sync(deps: Deps) -> Optional[str]:
+    q = deps.questionnaire
     text = (
         f"{q.accreditation_details} {q.source_of_funds_description}"
     ).lower()
     
     print("\nChecking for suspicious terms...")
     
-    # Check for suspicious keywords with word boundaries
-    for kw in ctx.deps.suspicious_keywords:
-        # Use word boundaries to match whole words only
-        pattern = r'\b' + re.escape(kw) + r'\b'
-        if re.search(pattern, text, re.IGNORECASE):
-            print(f"Found suspicious keyword: {kw}")
-            return "Ambiguous source of funds"
+    terms = deps.terms
+    
+    # Single-word keywords are a membership test on the text's tokens
+    hits = terms.single_keywords.intersection(_TOKEN_RE.findall(text))
+    if hits:
+        print(f"Found suspicious keyword: {min(hits)}")
+        return "Ambiguous source of funds"
     
-    # Check for suspicious patterns
-    for pattern in ctx.deps.suspicious_patterns:
-        if re.search(pattern["pattern"], text, re.IGNORECASE):
+    # Multi-word keywords are matched with word boundaries in a single pass
+    kw = find_keyword(terms.keyword_automaton, text)
+    if kw:
+        print(f"Found suspicious keyword: {kw}")
+        return "Ambiguous source of funds"
+    
+    # Plain-text patterns only need a substring check
+    for literal, description in terms.literal_patterns:
+        if literal in text:
+            print(f"Found suspicious pattern: {description}")
+            return "Ambiguous source of funds"
+
+    # Only run a regex if the literal it requires is present
+    for prematch, regex, description in terms.prematched_patterns:
+        if prematch in text and regex.search(text):
+            print(f"Found suspicious pattern: {description}")
+            return "Ambiguous source of funds"
+
+    # Check the remaining patterns in one pass over the combined regex
+    if terms.pattern_regex:
+        match = terms.pattern_regex.search(text)
+        if match:
+            pattern = terms.patterns[int(match.lastgroup[1:])]
             print(f"Found suspicious pattern: {pattern['description']}")
             return "Ambiguous source of funds"
+    else:
+        for regex, description in terms.regex_patterns:
+            if regex.search(text):
+                print(f"Found suspicious pattern: {description}")
+                return "Ambiguous source of funds"
     
     # Check for negative accreditation
     if "does not meet" in text:
@@ -115,84 +533,96 @@ async def ambiguity_checker(ctx: RunContext[Deps]) -> Optional[str]:
     return None
 
 
-@questionnaire_agent.tool
-async def decision_maker(ctx: RunContext[Deps]) -> str:
-    """Determine the final decision based on review and ambiguity."""
-    q = ctx.deps.questionnaire
+def _decision_sync(deps: Deps) -> Tuple[str, List[str], Optional[str]]:
+    q = deps.questionnaire
     
     print("\nMaking final decision...")
     
-    missing = await basic_review(ctx)
+    missing = _basic_review_sync(deps)
 
     if missing:
         print("Decision: Return (missing fields)")
-        return "Return"
+        return "Return", missing, None
 
     if (not q.investment_amount or 
-            q.investment_amount < ctx.deps.min_investment_amount):
+            q.investment_amount < deps.min_investment_amount):
         print("Decision: Return (invalid investment amount)")
-        return "Return"
+        return "Return", missing, None
+
+    # Check for obvious issues
+    ambiguity = _ambiguity_sync(deps)
 
     if not q.is_accredited_investor:
         print("Decision: Escalate (not accredited)")
-        return "Escalate"
+        return "Escalate", missing, ambiguity
 
-    # Check for obvious issues
-    ambiguity = await ambiguity_checker(ctx)
     if ambiguity:
         print(f"Decision: Escalate ({ambiguity})")
-        return "Escalate"
+        return "Escalate", missing, ambiguity
 
     print("Decision: Approve (all checks passed)")
-    return "Approve"
+    return "Approve", missing, None
 
 
-async def process_questionnaire(questionnaire: Questionnaire) -> Response:
+# The checks are pure CPU work, so the agent tools are thin async wrappers
+# around the sync versions above.
+@questionnaire_agent.tool
+async def basic_review(ctx: RunContext[Deps]) -> List[str]:
+    """Check for required fields and perform basic validations."""
+    return _basic_review_sync(ctx.deps)
+
+
+@questionnaire_agent.tool
+async def ambiguity_checker(ctx: RunContext[Deps]) -> Optional[str]:
+    """Analyze text fields for ambiguity and concerning terms."""
+    return _ambiguity_sync(ctx.deps)
+
+
+@questionnaire_agent.tool
+async def decision_maker(
+    ctx: RunContext[Deps]
+) -> Tuple[str, List[str], Optional[str]]:
+    """Determine the final decision based on review and ambiguity.
+
+    Returns the decision together with the missing fields and escalation
+    reason it was based on, so callers don't need to re-run the checks.
+    """
+    return _decision_sync(ctx.deps)
+
+
+def make_shared_deps(**kwargs) -> Deps:
+    """Build Deps once for a batch of questionnaires.
+
+    The suspicious terms and validator are the same for every questionnaire,
+    so process_questionnaire only has to swap in the questionnaire. The
+    result has no questionnaire and is only a template: copy it with
+    replace(shared, questionnaire=q) before handing it to the agent.
+    """
+    return Deps(**kwargs)
+
+
+async def process_questionnaire(
+    questionnaire: Questionnaire, shared: Optional[Deps] = None
+) -> Response:
     """Process a questionnaire and return a response."""
-    # Load suspicious terms
-    keywords, patterns = load_suspicious_terms()
-    
-    deps = Deps(
-        questionnaire=questionnaire,
-        suspicious_keywords=keywords,
-        suspicious_patterns=patterns
-    )
+    if shared is None:
+        shared = make_shared_deps()
+    deps = replace(shared, questionnaire=questionnaire)
     
     # Run the agent with the prompt template questionnaire
     await questionnaire_agent.run(
-        f"""Review this investment questionnaire:
-        - Investor Name: {questionnaire.investor_name}
-        - Investment Amount: {questionnaire.investment_amount}
-        - Accreditation Status: {
-            'Accredited' if questionnaire.is_accredited_investor 
-            else 'Not Accredited'
-        }
-        - Accreditation Details: {questionnaire.accreditation_details}
-        - Source of Funds: {questionnaire.source_of_funds_description}
-        - Tax ID Provided: {questionnaire.tax_id_provided}
-        - Signature Present: {questionnaire.signature_present}
-        \n
-        Use the tools to check for issues and make a decision (Approve, Return or Escalate).
-        """,
+        PROMPT_TEMPLATE.format(
+            q=questionnaire,
+            accreditation_status=(
+                "Accredited" if questionnaire.is_accredited_investor
+                else "Not Accredited"
+            )
+        ),
         deps=deps
     )
     
-    # Create a context for tool calls using the agent's model
-    tool_ctx = RunContext(
-        deps=deps,
-        model=questionnaire_agent.model,
-        usage={},
-        prompt=""
-    )
-    
-    # Get the decision and reasons
-    decision = await decision_maker(tool_ctx)
-    missing_fields = await basic_review(tool_ctx)
-    
-    # Only get escalation reason if decision is Escalate
-    escalation_reason = None
-    if decision == "Escalate":
-        escalation_reason = await ambiguity_checker(tool_ctx)
+    # Get the decision and reasons from a single pass over the checks
+    decision, missing_fields, escalation_reason = _decision_sync(deps)
     
     # Create response with all fields
     response = Response(
@@ -202,27 +632,89 @@ async def process_questionnaire(questionnaire: Questionnaire) -> Response:
         escalation_reason=escalation_reason
     )
     
-    # Load existing responses
-    try:
-        with open(deps.response_path, "r") as f:
-            content = f.read().strip()
-            responses = json.loads(content) if content else []
-    except (FileNotFoundError, json.JSONDecodeError):
-        # Initialize an empty reponse array if repsonse.json is uncreated
-        responses = []
-    
-    # Convert to dict and format for output
+    return response
+
+
+def _response_to_dict(response: Response) -> Dict:
+    """Format a response for output."""
     response_dict = response.model_dump()
     # Set missing_fields to null if empty
     if not response_dict["missing_fields"]:
         response_dict["missing_fields"] = None
     # Only include escalation_reason for Escalate decisions
-    if decision != "Escalate":
+    if response.decision != "Escalate":
         response_dict["escalation_reason"] = None
+    return response_dict
+
+
+def save_responses(
+    responses: List[Response],
+    response_path: Path = RESPONSE_PATH
+) -> None:
+    """Append a batch of responses to the NDJSON response file."""
+    with open(response_path, "a", encoding="utf-8") as f:
+        for response in responses:
+            f.write(json_io.dumps(_response_to_dict(response)) + "\n")
+
+
+def load_responses(response_path: Path = RESPONSE_PATH) -> List[Dict]:
+    """Load all saved responses from the NDJSON response file."""
+    try:
+        with open(response_path, "r", encoding="utf-8") as f:
+            return [json_io.loads(line) for line in f if line.strip()]
+    except FileNotFoundError:
+        return []
+
+
+def migrate_responses(
+    json_path: Path = Path("data/response.json"),
+    response_path: Path = RESPONSE_PATH
+) -> None:
+    """Convert a legacy JSON array response file to NDJSON.
+
+    Does nothing if the NDJSON file already exists, so it is safe to call
+    more than once. The legacy file is left in place.
+    """
+    if response_path.exists():
+        return
+    try:
+        with open(json_path, "r", encoding="utf-8") as f:
+            content = f.read().strip()
+            responses = json_io.loads(content) if content else []
+    except FileNotFoundError:
+        return
+    except json_io.JSONDecodeError:
+        # Treat a corrupt legacy file as empty, like the old response writer
+        responses = []
+    if not isinstance(responses, list):
+        responses = []
     
-    responses.append(response_dict)
-    
-    # Save updated responses
-    with open(deps.response_path, "w") as f:
-        json.dump(responses, indent=2, fp=f)    
-    return response
+    with open(response_path, "w", encoding="utf-8") as f:
+        for response_dict in responses:
+            f.write(json_io.dumps(response_dict) + "\n")
+
+
+def export_responses_json(
+    json_path: Path = EXPORT_PATH,
+    response_path: Path = RESPONSE_PATH
+) -> int:
+    """Write the NDJSON responses out as a single JSON array.
+
+    Records are streamed one line at a time, so earlier records are never
+    re-serialized and the whole file is never held in memory. Returns the
+    number of records written.
+    """
+    count = 0
+    with open(response_path, "r", encoding="utf-8") as src, \
+            open(json_path, "w", encoding="utf-8") as dst:
+        dst.write("[\n")
+        for line in src:
+            line = line.strip()
+            if not line:
+                continue
+            if count:
+                dst.write(",\n")
+            dst.write(line)
+            count += 1
+        dst.write("\n]\n")
+    return count
@@ -0,0 +1,17 @@
+from agent import EXPORT_PATH, RESPONSE_PATH, export_responses_json
+
+
+def main():
+    # Convert the NDJSON responses for consumers that expect a JSON array
+    json_path = EXPORT_PATH
+    try:
+        count = export_responses_json(json_path, RESPONSE_PATH)
+    except FileNotFoundError:
+        print(f"Error: Could not find {RESPONSE_PATH}")
+        return
+    
+    print(f"Exported {count} responses to {json_path}")
+
+
+if __name__ == "__main__":
+    main()
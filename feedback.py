@@ -1,21 +1,24 @@
 from __future__ import annotations as _annotations
 from dotenv import load_dotenv
 
-import json
 import asyncio
 from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Dict, List
+from typing import Dict, List, Set
 from pydantic_ai import Agent, RunContext
 
+from agent import reload_suspicious_terms
+from helpers import json_io
+
 load_dotenv()
 
 
 @dataclass
 class FeedbackDeps:
     keywords_file: Path = Path("data/suspicious_keywords.json")
-    current_keywords: List[str] = field(default_factory=list)
+    current_keywords: Set[str] = field(default_factory=set)
     current_patterns: List[Dict] = field(default_factory=list)
+    _pattern_keys: Set[str] = field(default_factory=set)
 
 
 feedback_agent = Agent(
@@ -35,12 +38,13 @@ feedback_agent = Agent(
 async def load_current_data(ctx: RunContext[FeedbackDeps]) -> Dict:
     """Load current keywords and patterns from JSON file."""
     try:
-        with open(ctx.deps.keywords_file, "r") as f:
-            data = json.load(f)
-            ctx.deps.current_keywords = data["keywords"]
+        with open(ctx.deps.keywords_file, "r", encoding="utf-8") as f:
+            data = json_io.load(f)
+            ctx.deps.current_keywords = set(data["keywords"])
             ctx.deps.current_patterns = data["patterns"]
+            ctx.deps._pattern_keys = {p["pattern"] for p in data["patterns"]}
             return data
-    except (FileNotFoundError, json.JSONDecodeError):
+    except (FileNotFoundError, json_io.JSONDecodeError):
         return {"keywords": [], "patterns": []}
 
 
@@ -48,14 +52,15 @@ async def load_current_data(ctx: RunContext[FeedbackDeps]) -> Dict:
 async def add_keyword(ctx: RunContext[FeedbackDeps], keyword: str) -> None:
     """Add a new keyword to the list."""
     if keyword not in ctx.deps.current_keywords:
-        ctx.deps.current_keywords.append(keyword)
+        ctx.deps.current_keywords.add(keyword)
         # Save updated keywords
-        with open(ctx.deps.keywords_file, "r+") as f:
-            data = json.load(f)
-            data["keywords"] = ctx.deps.current_keywords
+        with open(ctx.deps.keywords_file, "r+", encoding="utf-8") as f:
+            data = json_io.load(f)
+            data["keywords"] = sorted(ctx.deps.current_keywords)
             f.seek(0)
-            json.dump(data, f, indent=2)
+            json_io.dump(data, f, indent=True)
             f.truncate()
+        reload_suspicious_terms(ctx.deps.keywords_file)
 
 
 @feedback_agent.tool
@@ -65,16 +70,19 @@ async def add_pattern(
     description: str
 ) -> None:
     """Add a new pattern with description."""
-    new_pattern = {"pattern": pattern, "description": description}
-    if new_pattern not in ctx.deps.current_patterns:
-        ctx.deps.current_patterns.append(new_pattern)
+    if pattern not in ctx.deps._pattern_keys:
+        ctx.deps._pattern_keys.add(pattern)
+        ctx.deps.current_patterns.append(
+            {"pattern": pattern, "description": description}
+        )
         # Save updated patterns
-        with open(ctx.deps.keywords_file, "r+") as f:
-            data = json.load(f)
+        with open(ctx.deps.keywords_file, "r+", encoding="utf-8") as f:
+            data = json_io.load(f)
             data["patterns"] = ctx.deps.current_patterns
             f.seek(0)
-            json.dump(data, f, indent=2)
+            json_io.dump(data, f, indent=True)
             f.truncate()
+        reload_suspicious_terms(ctx.deps.keywords_file)
 
 
 def main():
@@ -101,7 +109,7 @@ def main():
     
     print("\nUpdated suspicious terms:")
     print("\nKeywords:")
-    for kw in ctx.deps.current_keywords:
+    for kw in sorted(ctx.deps.current_keywords):
         print(f"- {kw}")
     
     print("\nPatterns:")
@@ -0,0 +1,35 @@
+import json
+from typing import IO, Any
+
+try:
+    import orjson
+except ImportError:  # Fall back to the standard library
+    orjson = None
+
+# orjson.JSONDecodeError subclasses this, so callers can catch it either way
+JSONDecodeError = json.JSONDecodeError
+
+
+def loads(data: str) -> Any:
+    """Parse a JSON string."""
+    if orjson is None:
+        return json.loads(data)
+    return orjson.loads(data)
+
+
+def dumps(obj: Any, indent: bool = False) -> str:
+    """Serialize an object to a JSON string, indented by 2 spaces if asked."""
+    if orjson is None:
+        return json.dumps(obj, indent=2 if indent else None)
+    option = orjson.OPT_INDENT_2 if indent else 0
+    return orjson.dumps(obj, option=option).decode()
+
+
+def load(fp: IO[str]) -> Any:
+    """Parse JSON from an open text file."""
+    return loads(fp.read())
+
+
+def dump(obj: Any, fp: IO[str], indent: bool = False) -> None:
+    """Write an object as JSON to an open text file."""
+    fp.write(dumps(obj, indent=indent))
@@ -1,27 +1,48 @@
-import json
-from typing import Dict, List, Set
+import re
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Set
 from pathlib import Path
 
+from helpers import json_io
+
+# Feedback words worth keeping: 4+ letters, punctuation stripped
+_FEEDBACK_WORD_RE = re.compile(r"[a-z]{4,}")
+
 
 class KeywordManager:
     def __init__(self, file_path: str = "data/suspicious_keywords.json"):
         self.file_path = Path(file_path)
         self.keywords: Dict = {}
         self.patterns: List[Dict] = []
+        # Set mirrors of each category's examples for O(1) membership checks,
+        # built on first use
+        self._examples_sets: Dict[str, Set[str]] = {}
+        # Unsaved changes, written on the next flush
+        self.dirty = False
+        self._batch_depth = 0
         self.load_keywords()
 
     def load_keywords(self) -> None:
         """Load keywords and patterns from JSON file."""
         try:
-            with open(self.file_path, "r") as f:
-                data = json.load(f)
+            with open(self.file_path, "r", encoding="utf-8") as f:
+                data = json_io.load(f)
                 self.keywords = data["keywords"]
                 self.patterns = data["patterns"]
-        except (FileNotFoundError, json.JSONDecodeError):
+        except (FileNotFoundError, json_io.JSONDecodeError):
             # Initialize with default values if file doesn't exist
             self.keywords = {}
             self.patterns = []
             self.save_keywords()
+        self._examples_sets = {}
+
+    def _examples_set(self, category: str) -> Set[str]:
+        """Return the set mirror of a category's examples."""
+        examples_set = self._examples_sets.get(category)
+        if examples_set is None:
+            examples_set = set(self.keywords[category]["examples"])
+            self._examples_sets[category] = examples_set
+        return examples_set
 
     def save_keywords(self) -> None:
         """Save keywords and patterns to JSON file."""
@@ -29,8 +50,31 @@ class KeywordManager:
             "keywords": self.keywords,
             "patterns": self.patterns
         }
-        with open(self.file_path, "w") as f:
-            json.dump(data, indent=4, fp=f)
+        with open(self.file_path, "w", encoding="utf-8") as f:
+            json_io.dump(data, f, indent=True)
+        self.dirty = False
+
+    def _flush(self) -> None:
+        """Save pending changes, if any."""
+        if self.dirty:
+            self.save_keywords()
+
+    def _mark_dirty(self) -> None:
+        """Record a change, saving right away unless inside a batch."""
+        self.dirty = True
+        if not self._batch_depth:
+            self._flush()
+
+    @contextmanager
+    def batch(self) -> Iterator["KeywordManager"]:
+        """Group several changes into a single save when the block exits."""
+        self._batch_depth += 1
+        try:
+            yield self
+        finally:
+            self._batch_depth -= 1
+            if not self._batch_depth:
+                self._flush()
 
     def get_all_keywords(self) -> Set[str]:
         """Get all keywords as a flat set."""
@@ -43,9 +87,9 @@ class KeywordManager:
         """Get all patterns as a list."""
         return [p["pattern"] for p in self.patterns]
 
-    def add_keyword(self, category: str, keyword: str,
-                   description: str = None) -> None:
-        """Add a new keyword to a category."""
+    def _ensure_category(self, category: str,
+                         description: str = None) -> Set[str]:
+        """Create a category if needed and return its examples set."""
         if category not in self.keywords:
             self.keywords[category] = {
                 "category": "medium_risk",
@@ -53,9 +97,16 @@ class KeywordManager:
                     f"Keywords related to {category}",
                 "examples": []
             }
-        if keyword not in self.keywords[category]["examples"]:
+        return self._examples_set(category)
+
+    def add_keyword(self, category: str, keyword: str,
+                   description: str = None) -> None:
+        """Add a new keyword to a category."""
+        examples_set = self._ensure_category(category, description)
+        if keyword not in examples_set:
+            examples_set.add(keyword)
             self.keywords[category]["examples"].append(keyword)
-            self.save_keywords()
+            self._mark_dirty()
 
     def add_pattern(self, pattern: str, description: str) -> None:
         """Add a new pattern."""
@@ -64,29 +115,41 @@ class KeywordManager:
                 "pattern": pattern,
                 "description": description
             })
-            self.save_keywords()
+            self._mark_dirty()
 
     def remove_keyword(self, category: str, keyword: str) -> None:
         """Remove a keyword from a category."""
         if category in self.keywords:
-            if keyword in self.keywords[category]["examples"]:
+            examples_set = self._examples_set(category)
+            if keyword in examples_set:
+                examples_set.discard(keyword)
                 self.keywords[category]["examples"].remove(keyword)
-                self.save_keywords()
+                self._mark_dirty()
 
     def remove_pattern(self, pattern: str) -> None:
         """Remove a pattern."""
-        self.patterns = [p for p in self.patterns if p["pattern"] != pattern]
-        self.save_keywords()
+        patterns = [p for p in self.patterns if p["pattern"] != pattern]
+        if len(patterns) != len(self.patterns):
+            self.patterns = patterns
+            self._mark_dirty()
 
     def update_from_feedback(self, feedback_text: str) -> None:
         """Update keywords and patterns based on feedback text."""
         # This is a simple implementation - you might want to use NLP
         # or other techniques to extract new keywords/patterns
-        words = feedback_text.lower().split()
-        for word in words:
-            if len(word) > 3:  # Only consider words longer than 3 characters
-                self.add_keyword(
-                    "feedback", 
-                    word,
-                    f"Added from feedback: {feedback_text[:50]}..."
-                ) 
\ No newline at end of file
+        words = _FEEDBACK_WORD_RE.findall(feedback_text.lower())
+        existing = (
+            self._examples_set("feedback")
+            if "feedback" in self.keywords else set()
+        )
+        # dict.fromkeys drops repeats while keeping the order words appeared
+        new_words = [w for w in dict.fromkeys(words) if w not in existing]
+        if not new_words:
+            return
+        examples_set = self._ensure_category(
+            "feedback",
+            f"Added from feedback: {feedback_text[:50]}..."
+        )
+        examples_set.update(new_words)
+        self.keywords["feedback"]["examples"].extend(new_words)
+        self._mark_dirty() 
\ No newline at end of file
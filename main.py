@@ -1,39 +1,99 @@
 import asyncio
-import json
 from pathlib import Path
-from models import Questionnaire
-from agent import process_questionnaire
+from typing import List, get_args
+from helpers import json_io
+from models import Questionnaire, Response
+from agent import (
+    Deps, make_shared_deps, migrate_responses, process_questionnaire,
+    save_responses
+)
 
+# Upper bound on questionnaires being reviewed by the LLM at the same time
+MAX_CONCURRENT_REVIEWS = 16
 
-def process_questionnaire_data(data: dict) -> None:
+
+def _trusted_types(annotation) -> tuple:
+    types = tuple(t for t in get_args(annotation) or (annotation,)
+                  if isinstance(t, type))
+    return types + (int,) if float in types else types
+
+
+# Python types each questionnaire field can hold without pydantic coercion
+_FIELD_TYPES = {
+    name: (_trusted_types(info.annotation), info.is_required())
+    for name, info in Questionnaire.model_fields.items()
+}
+
+
+def build_questionnaire(data: dict) -> Questionnaire:
+    """Build a Questionnaire, only running pydantic validation when needed."""
+    for name, (types, required) in _FIELD_TYPES.items():
+        if name in data:
+            if not isinstance(data[name], types):
+                break
+        elif required:
+            break
+    else:
+        # Already well-typed, so skip validation
+        return Questionnaire.model_construct(**data)
+    # Coerce values such as "250000" or report errors before the LLM call
+    return Questionnaire(**data)
+
+
+async def process_questionnaire_data(
+    data: dict, semaphore: asyncio.Semaphore, shared: Deps
+) -> Response:
     """Process a questionnaire from dictionary data."""
-    try:
-        questionnaire = Questionnaire(**data)
-        asyncio.run(process_questionnaire(questionnaire))
-    except Exception as e:
-        print(f"Error processing questionnaire: {str(e)}")
+    questionnaire = build_questionnaire(data)
+    async with semaphore:
+        return await process_questionnaire(questionnaire, shared)
+
+
+async def _run_all(questionnaires: List[dict]) -> List[Response]:
+    """Process all questionnaires concurrently on a single event loop."""
+    semaphore = asyncio.Semaphore(MAX_CONCURRENT_REVIEWS)
+    shared = make_shared_deps()
+    results = await asyncio.gather(
+        *[
+            process_questionnaire_data(d, semaphore, shared)
+            for d in questionnaires
+        ],
+        return_exceptions=True
+    )
+    responses = []
+    for result in results:
+        if isinstance(result, BaseException):
+            print(f"Error processing questionnaire: {str(result)}")
+        else:
+            responses.append(result)
+    return responses
 
 
 def main():
+    # Carry over responses from the old JSON array format before appending
+    migrate_responses()
+    
     # Load questionnaires from JSON file
     questionnaire_path = Path("data/questionnaire.json")
     try:
-        with open(questionnaire_path, "r") as f:
-            questionnaires = json.load(f)
+        with open(questionnaire_path, "r", encoding="utf-8") as f:
+            questionnaires = json_io.load(f)
     except FileNotFoundError:
         print(f"Error: Could not find {questionnaire_path}")
         return
-    except json.JSONDecodeError:
+    except json_io.JSONDecodeError:
         print(f"Error: Invalid JSON in {questionnaire_path}")
         return
     
-    # Process each questionnaire
-    for questionnaire_data in questionnaires:
-        process_questionnaire_data(questionnaire_data)
+    # Process all questionnaires
+    responses = asyncio.run(_run_all(questionnaires))
+    
+    # Write all responses in one go
+    save_responses(responses)
     
     print(
         f"Processed {len(questionnaires)} questionnaires. \n"
-        "Results saved to data/response.json"
+        "Results saved to data/response.ndjson"
     )
 
 
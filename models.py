@@ -70,7 +70,7 @@ class Config:
         "gambling", "crypto", "cryptocurrency", "gift",
         "offshore", "tbd", "undisclosed", "pending",
         "maybe", "perhaps", "possibly", "undetermined",
-        "to be determined", "tbd", "pending review",
+        "to be determined", "pending review",
         "under review", "in progress", "not specified",
         "various", "including", "family contributions",
         "black market", "undisclosed source", "private",